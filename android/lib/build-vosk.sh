@@ -31,9 +31,19 @@ ANDROID_TOOLCHAIN_PATH=$ANDROID_NDK_HOME/toolchains/llvm/prebuilt/${OS_NAME}-x86
 WORKDIR_BASE=`pwd`/build
 PATH=$ANDROID_TOOLCHAIN_PATH/bin:$PATH
 OPENFST_VERSION=1.8.0
+ARCHS=(armeabi-v7a arm64-v8a x86_64 x86)
+# All ABIs are built at the same time, so share the jobs between them
+JOBS=$(( (${JOBS:-$(nproc)} + ${#ARCHS[@]} - 1) / ${#ARCHS[@]} ))
+
+# Cache compiler output between runs if ccache is installed
+if command -v ccache > /dev/null 2>&1; then
+    LAUNCHER=ccache
+    export CCACHE_DIR=${CCACHE_DIR:-$WORKDIR_BASE/ccache}
+fi
 
-for arch in armeabi-v7a arm64-v8a x86_64 x86; do
+build_arch() {
 
+arch=$1
 WORKDIR=${WORKDIR_BASE}/kaldi_${arch}
 
 case $arch in
@@ -82,16 +92,35 @@ esac
 
 mkdir -p $WORKDIR/local/lib
 
-# openblas first
+# Fetch all sources at once, the clones are independent. Checkouts left
+# by a previous run are reused
 cd $WORKDIR
-git clone -b v0.3.20 --single-branch https://github.com/xianyi/OpenBLAS
+CLONE_PIDS=()
+[ -d OpenBLAS ] || git clone -b v0.3.20 --single-branch https://github.com/xianyi/OpenBLAS &
+CLONE_PIDS+=($!)
+[ -d clapack ] || git clone -b v3.2.1  --single-branch https://github.com/alphacep/clapack &
+CLONE_PIDS+=($!)
+[ -d openfst ] || git clone https://github.com/alphacep/openfst &
+CLONE_PIDS+=($!)
+[ -d kaldi ] || git clone -b vosk-android --single-branch https://github.com/alphacep/kaldi &
+CLONE_PIDS+=($!)
+CLONE_STATUS=0
+for pid in "${CLONE_PIDS[@]}"; do
+    wait $pid || CLONE_STATUS=1
+done
+if [ $CLONE_STATUS -ne 0 ]; then
+    echo "Failed to fetch sources for $arch"
+    return 1
+fi
 
+# openblas first
 # 使用 CMake 构建 OpenBLAS 以避免兼容性问题
 cmake -S "$WORKDIR/OpenBLAS" -B "$WORKDIR/openblas-build" \
   -G Ninja \
   -DCMAKE_TOOLCHAIN_FILE="$ANDROID_NDK_HOME/build/cmake/android.toolchain.cmake" \
   -DANDROID_ABI=$arch \
   -DANDROID_PLATFORM=21 \
+  ${LAUNCHER:+-DCMAKE_C_COMPILER_LAUNCHER=$LAUNCHER} \
   -DBUILD_SHARED_LIBS=OFF \
   -DNOFORTRAN=ON \
   -DDYNAMIC_ARCH=OFF \
@@ -101,56 +130,76 @@ cmake -S "$WORKDIR/OpenBLAS" -B "$WORKDIR/openblas-build" \
   -DBUILD_TESTING=OFF \
   -DNO_CBLAS=ON
 
-ninja -C "$WORKDIR/openblas-build" -j 8
+ninja -C "$WORKDIR/openblas-build" -j $JOBS
 ninja -C "$WORKDIR/openblas-build" install
 
 # CLAPACK
 cd $WORKDIR
-git clone -b v3.2.1  --single-branch https://github.com/alphacep/clapack
-mkdir -p clapack/BUILD && cd clapack/BUILD
-cmake -DCMAKE_C_FLAGS="$ARCHFLAGS" -DCMAKE_C_COMPILER_TARGET=$HOST \
+mkdir -p clapack/build-ninja && cd clapack/build-ninja
+cmake -G Ninja -DCMAKE_C_FLAGS="$ARCHFLAGS" -DCMAKE_C_COMPILER_TARGET=$HOST \
     -DCMAKE_C_COMPILER=$CC -DCMAKE_SYSTEM_NAME=Generic -DCMAKE_AR=$ANDROID_TOOLCHAIN_PATH/bin/$AR \
     -DCMAKE_TRY_COMPILE_TARGET_TYPE=STATIC_LIBRARY \
+    ${LAUNCHER:+-DCMAKE_C_COMPILER_LAUNCHER=$LAUNCHER} \
     -DCMAKE_CROSSCOMPILING=True ..
-make -j 8 -C F2CLIBS/libf2c
-make -j 8 -C BLAS/SRC
-make -j 8 -C SRC
+ninja -j $JOBS F2CLIBS/libf2c/all BLAS/SRC/all SRC/all
 find . -name "*.a" | xargs cp -t $WORKDIR/local/lib
 
 # tools directory --> we'll only compile OpenFST
-cd $WORKDIR
-git clone https://github.com/alphacep/openfst
-cd openfst
+cd $WORKDIR/openfst
 autoreconf -i
-CXX=$CXX CXXFLAGS="$ARCHFLAGS -O3 -DFST_NO_DYNAMIC_LINKING" ./configure --prefix=${WORKDIR}/local \
+CXX="${LAUNCHER:+$LAUNCHER }$CXX" CXXFLAGS="$ARCHFLAGS -O3 -DFST_NO_DYNAMIC_LINKING" ./configure --prefix=${WORKDIR}/local \
     --enable-shared --enable-static --with-pic --disable-bin \
     --enable-lookahead-fsts --enable-ngram-fsts --host=$HOST --build=x86-linux-gnu
-make -j 8
+make -j $JOBS
 make install
 
 # Kaldi itself
-cd $WORKDIR
-git clone -b vosk-android --single-branch https://github.com/alphacep/kaldi
 cd $WORKDIR/kaldi/src
 CXX=$CXX AR=$AR RANLIB=$RANLIB CXXFLAGS="$ARCHFLAGS -O3 -DFST_NO_DYNAMIC_LINKING" ./configure --use-cuda=no \
     --mathlib=OPENBLAS_CLAPACK --shared \
     --android-incdir=${ANDROID_TOOLCHAIN_PATH}/sysroot/usr/include \
     --host=$HOST --openblas-root=${WORKDIR}/local \
     --fst-root=${WORKDIR}/local --fst-version=${OPENFST_VERSION}
-make -j 8 depend
+make -j $JOBS depend CXX="${LAUNCHER:+$LAUNCHER }$CXX"
 cd $WORKDIR/kaldi/src
-make -j 8 online2 rnnlm
+make -j $JOBS online2 rnnlm CXX="${LAUNCHER:+$LAUNCHER }$CXX"
 
 # Vosk-api
 cd $WORKDIR
 mkdir -p $WORKDIR/vosk
-make -j 8 -C ${WORKDIR_BASE}/../../../src \
+make -j $JOBS -C ${WORKDIR_BASE}/../../../src \
     OUTDIR=$WORKDIR/vosk \
     KALDI_ROOT=${WORKDIR}/kaldi \
     OPENFST_ROOT=${WORKDIR}/local \
     OPENBLAS_ROOT=${WORKDIR}/local \
-    CXX=$CXX \
+    CXX="${LAUNCHER:+$LAUNCHER }$CXX" \
     EXTRA_LDFLAGS="-llog -static-libstdc++ -Wl,-soname,libvosk.so ${PAGESIZE_LDFLAGS}"
 cp $WORKDIR/vosk/libvosk.so $WORKDIR/../../src/main/jniLibs/$arch/libvosk.so
 
+}
+
+prefix_lines() {
+    while IFS= read -r line; do
+        echo "[$1] $line"
+    done
+}
+
+# ABIs use separate work directories, build them in parallel. Output is
+# streamed line by line with the ABI name in front and also kept in a log
+# per ABI. The first failing step fails the ABI, so that a library left by
+# a previous run is never copied as if it was just built
+mkdir -p $WORKDIR_BASE
+declare -A PIDS
+for arch in "${ARCHS[@]}"; do
+    (set -eo pipefail; build_arch $arch 2>&1 | tee $WORKDIR_BASE/build-$arch.log | prefix_lines $arch) &
+    PIDS[$arch]=$!
+done
+
+STATUS=0
+for arch in "${ARCHS[@]}"; do
+    if ! wait ${PIDS[$arch]}; then
+        echo "Build for $arch failed, see $WORKDIR_BASE/build-$arch.log"
+        STATUS=1
+    fi
 done
+exit $STATUS
@@ -73,9 +73,13 @@ class Model:
 
     def get_model_by_name(self, model_name):
         for directory in MODEL_DIRS:
-            if directory is None or not Path(directory).exists():
+            if directory is None:
+                continue
+            # Listing validates the directory too, no separate stat needed
+            try:
+                model_file_list = os.listdir(directory)
+            except OSError:
                 continue
-            model_file_list = os.listdir(directory)
             model_file = [model for model in model_file_list if model == model_name]
             if model_file != []:
                 return Path(directory, model_file[0])
@@ -90,9 +94,13 @@ class Model:
 
     def get_model_by_lang(self, lang):
         for directory in MODEL_DIRS:
-            if directory is None or not Path(directory).exists():
+            if directory is None:
+                continue
+            # Listing validates the directory too, no separate stat needed
+            try:
+                model_file_list = os.listdir(directory)
+            except OSError:
                 continue
-            model_file_list = os.listdir(directory)
             model_file = [model for model in model_file_list if
                     match(r"vosk-model(-small)?-{}".format(lang), model)]
             if model_file != []:
@@ -4,6 +4,7 @@ import argparse
 import logging
 import sys
 import os
+import shutil
 
 from pathlib import Path
 from vosk import list_models, list_languages
@@ -36,7 +37,7 @@ parser.add_argument(
         "--output", "-o", default="", type=str,
         help="optional output filename path")
 parser.add_argument(
-        "--output-type", "-t", default="txt", type=str,
+        "--output-type", "-t", default="txt", type=str, choices=["txt", "srt", "json"],
         help="optional arg output data type")
 parser.add_argument(
         "--tasks", "-ts", default=10, type=int,
@@ -68,6 +69,19 @@ def main():
             "please specify an existing file/directory")
         sys.exit(1)
 
+    if Path(args.input).is_dir() and args.output != "" and not Path(args.output).is_dir():
+        logging.info("Output folder {} does not exist, "\
+            "please specify an existing directory".format(args.output))
+        sys.exit(1)
+
+    if args.server is not None and args.tasks < 1:
+        logging.info("Number of tasks should be positive")
+        sys.exit(1)
+
+    if shutil.which("ffmpeg") is None:
+        logging.info("Missing FFMPEG, please install and try again")
+        sys.exit(1)
+
     transcriber = Transcriber(args)
 
     if Path(args.input).is_dir():
@@ -1,10 +1,10 @@
+import os
 import json
 import logging
 import asyncio
 import websockets
 import srt
 import datetime
-import shlex
 import subprocess
 
 from vosk import KaldiRecognizer, Model
@@ -15,6 +15,12 @@ from multiprocessing.dummy import Pool
 CHUNK_SIZE = 4000
 SAMPLE_RATE = 16000.0
 
+def available_cpus():
+    # Respect CPU affinity masks (taskset, cpusets); CFS quotas are not visible here
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
 class Transcriber:
 
     def __init__(self, args):
@@ -112,15 +118,15 @@ class Transcriber:
         return processed_result
 
     def resample_ffmpeg(self, infile):
-        cmd = shlex.split("ffmpeg -nostdin -loglevel quiet "
-                "-i \'{}\' -ar {} -ac 1 -f s16le -".format(str(infile), SAMPLE_RATE))
+        cmd = ["ffmpeg", "-nostdin", "-loglevel", "quiet",
+                "-i", str(infile), "-ar", str(SAMPLE_RATE), "-ac", "1", "-f", "s16le", "-"]
         stream = subprocess.Popen(cmd, stdout=subprocess.PIPE)
         return stream
 
     async def resample_ffmpeg_async(self, infile):
-        cmd = "ffmpeg -nostdin -loglevel quiet "\
-        "-i \'{}\' -ar {} -ac 1 -f s16le -".format(str(infile), SAMPLE_RATE)
-        return await asyncio.create_subprocess_shell(cmd, stdout=subprocess.PIPE)
+        cmd = ["ffmpeg", "-nostdin", "-loglevel", "quiet",
+                "-i", str(infile), "-ar", str(SAMPLE_RATE), "-ac", "1", "-f", "s16le", "-"]
+        return await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE)
 
     async def server_worker(self):
         while True:
@@ -191,7 +197,7 @@ class Transcriber:
         await asyncio.gather(*workers)
 
     def process_task_list_pool(self, task_list):
-        with Pool() as pool:
+        with Pool(available_cpus()) as pool:
             pool.map(self.pool_worker, task_list)
 
     def process_task_list(self, task_list):
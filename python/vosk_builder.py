@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 
 import os
+import subprocess
 from cffi import FFI
 
 vosk_root=os.environ.get("VOSK_SOURCE", "..")
-cpp_command = "cpp " + vosk_root + "/src/vosk_api.h"
+cpp_command = ["cpp", vosk_root + "/src/vosk_api.h"]
 
 ffibuilder = FFI()
 ffibuilder.set_source("vosk.vosk_cffi", None)
-ffibuilder.cdef(os.popen(cpp_command).read())
+ffibuilder.cdef(subprocess.check_output(cpp_command).decode("utf-8"))
 
 if __name__ == '__main__':
     ffibuilder.compile(verbose=True)